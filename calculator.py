@@ -7,47 +7,195 @@ advanced mathematical functions, memory operations, and calculation history.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import tkinter.font as tkfont
+import ast
+import concurrent.futures
+import functools
 import math
+import operator
 import decimal
-from decimal import Decimal, getcontext
+from decimal import Decimal
 import re
-from typing import List, Tuple, Optional, Union
+import sys
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, Deque, List, Mapping, Tuple, Optional, Union
 import logging
 
-# Configure decimal precision for high accuracy
-getcontext().prec = 50
-
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Colours for the tk widgets registered in CalculatorGUI._themed_widgets, per theme
+THEMES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    'dark': MappingProxyType({
+        'bg': '#2b2b2b',
+        'display_bg': '#1a1a1a',
+        'fg': '#ffffff',
+        'muted_fg': '#888888',
+        'btn_bg': '#404040',
+        'btn_fg': '#ffffff',
+    }),
+    'light': MappingProxyType({
+        'bg': '#f0f0f0',
+        'display_bg': '#ffffff',
+        'fg': '#1a1a1a',
+        'muted_fg': '#666666',
+        'btn_bg': '#d9d9d9',
+        'btn_fg': '#1a1a1a',
+    }),
+})
+
+# Button colours shared by both themes: (background, active background, pressed background)
+BUTTON_COLORS: Mapping[str, Tuple[str, str, str]] = MappingProxyType({
+    'number': ('#404040', '#505050', '#606060'),
+    'operator': ('#ff6b35', '#ff7b45', '#ff8b55'),
+    'function': ('#4a90e2', '#5aa0f2', '#6ab0ff'),
+    'memory': ('#7b68ee', '#8b78fe', '#9b88ff'),
+    'equals': ('#32cd32', '#42dd42', '#52ed52'),
+})
+BUTTON_FG = '#ffffff'
+
+# Tk named fonts: name -> (size, weight), all in FONT_FAMILY
+FONT_FAMILY = 'Segoe UI'
+FONT_SPECS: Mapping[str, Tuple[int, str]] = MappingProxyType({
+    'CalcNumberFont': (12, 'bold'),
+    'CalcFunctionFont': (9, 'bold'),
+    'CalcMemoryFont': (8, 'bold'),
+    'CalcEqualsFont': (14, 'bold'),
+    'CalcButtonFont': (10, 'bold'),
+    'CalcExpressionFont': (14, 'normal'),
+    'CalcResultFont': (28, 'bold'),
+    'CalcStatusFont': (10, 'normal'),
+    'CalcIconFont': (12, 'normal'),
+    'CalcTitleFont': (16, 'bold'),
+    'CalcListFont': (11, 'normal'),
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expr(expression: str) -> ast.Expression:
+    """Preprocess and parse an expression, caching the tree per expression."""
+    preprocessed = CalculatorEngine._preprocess_expression(expression)
+    return ast.parse(preprocessed, mode='eval')
+
+
+@functools.lru_cache(maxsize=256)
+def _factorial(n: int) -> int:
+    """Factorial with repeated arguments served from cache."""
+    return math.factorial(n)
+
+
+def _scale_argument(func: Callable[[float], float], factor: float) -> Callable[[float], float]:
+    """Wrap a one-argument function so its argument is multiplied by factor first."""
+    return lambda x: func(x * factor)
+
+
+def _scale_result(func: Callable[[float], float], factor: float) -> Callable[[float], float]:
+    """Wrap a one-argument function so its result is multiplied by factor."""
+    return lambda x: func(x) * factor
+
 
 class CalculatorEngine:
     """Core calculation engine handling mathematical operations and expression parsing."""
     
+    __slots__ = ('angle_mode', 'memory', 'history', 'on_change')
+    
+    _DEC_ZERO = Decimal(0)
+    
+    # Angle conversion factors, applied inline instead of via math.radians/degrees
+    _DEG2RAD = math.pi / 180.0
+    _RAD2DEG = 180.0 / math.pi
+    
+    # Characters _preprocess_expression rewrites
+    _NEEDS_PREPROC_RE = re.compile(r'[π^]')
+    
+    # Names, functions and operators the expression evaluator may dispatch to,
+    # built once per process rather than per engine or per evaluation
+    _CONSTANTS = {'pi': math.pi, 'e': math.e}
+    # Functions callable as math.name(...), with the math module's own semantics
+    # (radians, natural log)
+    _MATH_FUNCS = {
+        'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+        'asin': math.asin, 'acos': math.acos, 'atan': math.atan,
+        'sinh': math.sinh, 'cosh': math.cosh, 'tanh': math.tanh,
+        'sqrt': math.sqrt,
+        'log10': math.log10,
+        'log': math.log,
+        'factorial': _factorial,
+    }
+    # Functions callable by bare name, as entered from the keypad; log is base 10, ln natural
+    _FUNCS = {
+        'sinh': math.sinh, 'cosh': math.cosh, 'tanh': math.tanh,
+        'sqrt': math.sqrt,
+        'log': math.log10,
+        'ln': math.log,
+        'factorial': _factorial,
+        'abs': abs,
+    }
+    # _FUNCS plus the trig functions, per angle mode; in DEG mode sin/cos/tan take
+    # degrees and asin/acos/atan return degrees
+    _MODE_FUNCS = {
+        'RAD': {
+            **_FUNCS,
+            'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+            'asin': math.asin, 'acos': math.acos, 'atan': math.atan,
+        },
+        'DEG': {
+            **_FUNCS,
+            'sin': _scale_argument(math.sin, _DEG2RAD),
+            'cos': _scale_argument(math.cos, _DEG2RAD),
+            'tan': _scale_argument(math.tan, _DEG2RAD),
+            'asin': _scale_result(math.asin, _RAD2DEG),
+            'acos': _scale_result(math.acos, _RAD2DEG),
+            'atan': _scale_result(math.atan, _RAD2DEG),
+        },
+    }
+    # Python 3.7's parser emits ast.Num for number literals; from 3.8 they are ast.Constant
+    _LEGACY_NUM = ast.Num if sys.version_info < (3, 8) else None
+    _OPS = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: operator.truediv,
+        ast.FloorDiv: operator.floordiv,
+        ast.Pow: operator.pow,
+        ast.USub: operator.neg,
+        ast.UAdd: operator.pos,
+    }
+    
     def __init__(self):
         self.angle_mode = 'DEG'  # 'DEG' or 'RAD'
-        self.memory = Decimal('0')
-        self.history: List[Tuple[str, str]] = []  # (expression, result)
+        self.memory = self._DEC_ZERO
+        # (expression, result); only the last 100 calculations are kept
+        self.history: Deque[Tuple[str, str]] = deque(maxlen=100)
+        # Called after the angle mode or memory changes
+        self.on_change: Optional[Callable[[], None]] = None
         
     def set_angle_mode(self, mode: str) -> None:
         """Set angle mode to DEG or RAD."""
         if mode in ['DEG', 'RAD']:
             self.angle_mode = mode
-            logger.info(f"Angle mode set to {mode}")
+            logger.info("Angle mode set to %s", mode)
+            self._notify()
+    
+    def _notify(self) -> None:
+        """Inform the listener, if any, that angle mode or memory changed."""
+        if self.on_change is not None:
+            self.on_change()
     
     def deg_to_rad(self, degrees: float) -> float:
         """Convert degrees to radians."""
-        return math.radians(degrees)
+        return degrees * self._DEG2RAD
     
     def rad_to_deg(self, radians: float) -> float:
         """Convert radians to degrees."""
-        return math.degrees(radians)
+        return radians * self._RAD2DEG
     
-    def safe_eval(self, expression: str) -> Union[Decimal, str]:
+    def safe_eval(self, expression: str) -> Union[float, int, Decimal, str]:
         """
         Safely evaluate mathematical expressions with comprehensive error handling.
-        Returns Decimal result or error message string.
+        Returns the numeric result (float or int) or error message string.
         """
         try:
             # Clean and validate expression
@@ -55,131 +203,118 @@ class CalculatorEngine:
             if not expression:
                 return "Error: Empty expression"
             
-            # Replace common mathematical symbols and functions
-            expression = self._preprocess_expression(expression)
-            
-            # Validate expression for security
-            if not self._is_safe_expression(expression):
-                return "Error: Invalid expression"
+            # Preprocess and parse (cached)
+            tree = _compile_expr(expression)
             
-            # Evaluate using decimal for high precision
-            result = self._evaluate_expression(expression)
+            # Evaluate by walking the parsed tree; unsupported nodes are rejected
+            result = self._evaluate_expression(tree)
             
             # Check for special cases
-            if isinstance(result, (float, int)):
-                if math.isnan(result):
-                    return "Error: Not a number"
-                if math.isinf(result):
-                    return "Error: Infinity"
+            if isinstance(result, (Decimal, int)):
+                return result
             
-            return Decimal(str(result))
+            result = float(result)
+            if math.isnan(result):
+                return "Error: Not a number"
+            if math.isinf(result):
+                return "Error: Infinity"
+            
+            return result
             
         except ZeroDivisionError:
             return "Error: Division by zero"
+        except SyntaxError:
+            return "Error: Invalid expression"
         except ValueError as e:
             return f"Error: {str(e)}"
         except Exception as e:
-            logger.error(f"Unexpected error in safe_eval: {e}")
+            logger.error("Unexpected error in safe_eval: %s", e)
             return "Error: Invalid expression"
     
-    def _preprocess_expression(self, expression: str) -> str:
-        """Preprocess expression to handle mathematical functions and constants."""
-        # Replace constants
-        expression = expression.replace('π', str(math.pi))
-        expression = expression.replace('pi', str(math.pi))
-        expression = expression.replace('e', str(math.e))
+    @classmethod
+    def _preprocess_expression(cls, expression: str) -> str:
+        """Preprocess expression to handle the π glyph and the power operator."""
+        # Pure arithmetic needs no rewriting
+        if not cls._NEEDS_PREPROC_RE.search(expression):
+            return expression
+        
+        # Constants pi and e are resolved by the evaluator; only the π glyph needs mapping
+        expression = expression.replace('π', 'pi')
         
         # Replace power operator
         expression = expression.replace('^', '**')
         
-        # Handle trigonometric functions with angle mode conversion
-        trig_functions = ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'sinh', 'cosh', 'tanh']
-        
-        for func in trig_functions:
-            pattern = rf'{func}\s*\(([^)]+)\)'
-            matches = re.finditer(pattern, expression)
-            
-            for match in reversed(list(matches)):  # Reverse to avoid index issues
-                arg = match.group(1)
-                start, end = match.span()
-                
-                if func in ['sin', 'cos', 'tan', 'asin', 'acos', 'atan']:
-                    # Convert to radians if in degree mode
-                    if self.angle_mode == 'DEG':
-                        replacement = f'{func}(math.radians({arg}))'
-                    else:
-                        replacement = f'{func}({arg})'
-                else:
-                    replacement = f'math.{func}({arg})'
-                
-                expression = expression[:start] + replacement + expression[end:]
-        
-        # Handle other mathematical functions
-        expression = re.sub(r'sqrt\s*\(([^)]+)\)', r'math.sqrt(\1)', expression)
-        expression = re.sub(r'log\s*\(([^)]+)\)', r'math.log10(\1)', expression)
-        expression = re.sub(r'ln\s*\(([^)]+)\)', r'math.log(\1)', expression)
-        expression = re.sub(r'abs\s*\(([^)]+)\)', r'abs(\1)', expression)
-        expression = re.sub(r'factorial\s*\(([^)]+)\)', r'math.factorial(\1)', expression)
-        
+        # Functions and angle mode are handled by the evaluator on the parsed tree
         return expression
     
-    def _is_safe_expression(self, expression: str) -> bool:
-        """Validate that expression contains only safe mathematical operations."""
-        # Allowed characters and patterns
-        allowed_pattern = r'^[0-9+\-*/().\s,math\.\w]+$'
-        
-        # Check for dangerous patterns
-        dangerous_patterns = [
-            r'__',  # Double underscores
-            r'import',  # Import statements
-            r'exec',  # Exec statements
-            r'eval',  # Eval statements
-            r'open',  # File operations
-            r'file',  # File operations
-        ]
-        
-        if not re.match(allowed_pattern, expression):
-            return False
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, expression, re.IGNORECASE):
-                return False
-        
-        return True
+    def _resolve_function(self, node: ast.AST) -> Optional[Callable]:
+        """Return the callable for a ``name(...)`` or ``math.name(...)`` call target, if allowed."""
+        if isinstance(node, ast.Name):
+            return self._MODE_FUNCS[self.angle_mode].get(node.id)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'math':
+            return self._MATH_FUNCS.get(node.attr)
+        return None
     
-    def _evaluate_expression(self, expression: str) -> Union[float, int]:
-        """Evaluate the preprocessed expression safely."""
-        # Create a safe namespace for evaluation
-        safe_dict = {
-            'math': math,
-            'abs': abs,
-            'Decimal': Decimal,
-        }
-        
-        return eval(expression, {"__builtins__": {}}, safe_dict)
+    def _evaluate_expression(self, tree: ast.Expression) -> Union[float, int]:
+        """Evaluate the parsed expression safely."""
+        return self._walk(tree.body)
+    
+    def _walk(self, node: ast.AST) -> Union[float, int]:
+        """
+        Recursively evaluate an expression node.
+        Only whitelisted node types, operators, names and functions are accepted;
+        anything else raises ValueError.
+        """
+        node_type = type(node)
+        if node_type is ast.Constant and type(node.value) in (int, float):
+            return node.value
+        if node_type is self._LEGACY_NUM and type(node.n) in (int, float):
+            return node.n
+        if node_type is ast.Name and node.id in self._CONSTANTS:
+            return self._CONSTANTS[node.id]
+        if node_type is ast.BinOp and type(node.op) in self._OPS:
+            return self._OPS[type(node.op)](self._walk(node.left), self._walk(node.right))
+        if node_type is ast.UnaryOp and type(node.op) in self._OPS:
+            return self._OPS[type(node.op)](self._walk(node.operand))
+        if node_type is ast.Call and not node.keywords:
+            func = self._resolve_function(node.func)
+            if func is not None:
+                return func(*[self._walk(arg) for arg in node.args])
+        raise ValueError("Invalid expression")
     
     def calculate_percentage(self, value: str, percentage: str) -> Union[Decimal, str]:
-        """Calculate percentage (e.g., 100 + 10% = 110)."""
+        """
+        Calculate percentage (e.g., 100 + 10% = 110).
+        Uses 50-digit precision locally; the rest of the engine keeps the default context.
+        """
         try:
-            val = Decimal(value)
-            pct = Decimal(percentage)
-            result = val + (val * pct / 100)
-            return result
+            with decimal.localcontext() as ctx:
+                ctx.prec = 50
+                val = Decimal(value)
+                pct = Decimal(percentage)
+                return val + (val * pct / 100)
         except Exception as e:
             return f"Error: {str(e)}"
     
+    def _coerce(self, value: Union[Decimal, float, int, str]) -> Optional[Decimal]:
+        """Convert a value to Decimal for memory operations; returns None for error strings."""
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, str):
+            return None if value.startswith("Error:") else Decimal(value)
+        return Decimal(str(value))
+    
     def memory_store(self, value: Union[Decimal, str]) -> None:
         """Store value in memory."""
         try:
-            if isinstance(value, str):
-                if value.startswith("Error:"):
-                    return
-                self.memory = Decimal(value)
-            else:
-                self.memory = value
-            logger.info(f"Memory stored: {self.memory}")
+            val = self._coerce(value)
+            if val is None:
+                return
+            self.memory = val
+            logger.info("Memory stored: %s", self.memory)
+            self._notify()
         except Exception as e:
-            logger.error(f"Error storing in memory: {e}")
+            logger.error("Error storing in memory: %s", e)
     
     def memory_recall(self) -> Decimal:
         """Recall value from memory."""
@@ -187,48 +322,42 @@ class CalculatorEngine:
     
     def memory_clear(self) -> None:
         """Clear memory."""
-        self.memory = Decimal('0')
+        self.memory = self._DEC_ZERO
         logger.info("Memory cleared")
+        self._notify()
     
     def memory_add(self, value: Union[Decimal, str]) -> None:
         """Add value to memory."""
         try:
-            if isinstance(value, str):
-                if value.startswith("Error:"):
-                    return
-                val = Decimal(value)
-            else:
-                val = value
+            val = self._coerce(value)
+            if val is None:
+                return
             self.memory += val
-            logger.info(f"Memory add: {self.memory}")
+            logger.info("Memory add: %s", self.memory)
+            self._notify()
         except Exception as e:
-            logger.error(f"Error adding to memory: {e}")
+            logger.error("Error adding to memory: %s", e)
     
     def memory_subtract(self, value: Union[Decimal, str]) -> None:
         """Subtract value from memory."""
         try:
-            if isinstance(value, str):
-                if value.startswith("Error:"):
-                    return
-                val = Decimal(value)
-            else:
-                val = value
+            val = self._coerce(value)
+            if val is None:
+                return
             self.memory -= val
-            logger.info(f"Memory subtract: {self.memory}")
+            logger.info("Memory subtract: %s", self.memory)
+            self._notify()
         except Exception as e:
-            logger.error(f"Error subtracting from memory: {e}")
+            logger.error("Error subtracting from memory: %s", e)
     
     def add_to_history(self, expression: str, result: str) -> None:
         """Add calculation to history."""
         self.history.append((expression, result))
-        # Keep only last 100 calculations
-        if len(self.history) > 100:
-            self.history.pop(0)
-        logger.info(f"Added to history: {expression} = {result}")
+        logger.info("Added to history: %s = %s", expression, result)
     
     def get_history(self) -> List[Tuple[str, str]]:
         """Get calculation history."""
-        return self.history.copy()
+        return list(self.history)
     
     def clear_history(self) -> None:
         """Clear calculation history."""
@@ -239,32 +368,115 @@ class CalculatorEngine:
 class CalculatorGUI:
     """Main GUI class for the calculator application."""
     
+    # Every attribute assigned on self must be listed here; there is no __dict__
+    __slots__ = (
+        'root', 'engine',
+        'current_expression', 'current_result', 'is_new_calculation', 'dark_theme', '_num_has_dot',
+        '_last_expr_shown', '_last_result_shown', '_pending_display', '_last_status', '_pending_status',
+        '_refresh_scheduled',
+        'expression_var', 'expression_display', 'result_var', 'result_display', 'status_var',
+        '_themed_widgets', '_theme_button', '_toast_label', '_toast_job',
+        '_history_window', '_history_listbox', '_fonts', '_memory_recall', '_worker',
+    )
+    
+    # ttk frame style -> palette key for its background; recoloured once per style on theme change
+    _FRAME_STYLES = {
+        'Calc.TFrame': 'bg',
+        'Display.TFrame': 'display_bg',
+    }
+    
+    # Largest magnitude below which every integral float converts to int exactly
+    _EXACT_INT_LIMIT = 2 ** 53
+    
+    # How often the UI thread checks for finished worker jobs, in milliseconds
+    _POLL_MS = 20
+    
+    # Status bar text: angle mode and memory value
+    _STATUS_TEMPLATE = "%s | M: %s"
+    
+    # Keypad button text -> action; any text not listed is appended as a number
+    _TOKEN_ACTIONS = {
+        "sin": lambda s: s.add_function("sin("),
+        "cos": lambda s: s.add_function("cos("),
+        "tan": lambda s: s.add_function("tan("),
+        "log": lambda s: s.add_function("log("),
+        "ln": lambda s: s.add_function("ln("),
+        "√": lambda s: s.add_function("sqrt("),
+        "x²": lambda s: s.add_function("^2"),
+        "x^y": lambda s: s.add_function("^"),
+        "1/x": lambda s: s.add_function("1/"),
+        "|x|": lambda s: s.add_function("abs("),
+        "n!": lambda s: s.add_function("factorial("),
+        "%": lambda s: s.add_operator("%"),
+        "(": lambda s: s.add_operator("("),
+        ")": lambda s: s.add_operator(")"),
+        "/": lambda s: s.add_operator("/"),
+        "*": lambda s: s.add_operator("*"),
+        "-": lambda s: s.add_operator("-"),
+        "+": lambda s: s.add_operator("+"),
+        "±": lambda s: s.toggle_sign(),
+        "=": lambda s: s.calculate(),
+        ".": lambda s: s.add_decimal(),
+    }
+    
     def __init__(self):
         self.root = tk.Tk()
         self.engine = CalculatorEngine()
+        self._memory_recall = self.engine.memory_recall
         self.current_expression = ""
         self.current_result = "0"
         self.is_new_calculation = True
-        self.dark_theme = False
+        self.dark_theme = True
+        self._num_has_dot = False  # whether the number being typed already has a '.'
+        
+        # Last values written to the display and status bar, which of them need a refresh,
+        # and whether the shared refresh callback is already scheduled
+        self._last_expr_shown = ""
+        self._last_result_shown = "0"
+        self._pending_display = False
+        self._last_status = None
+        self._pending_status = False
+        self._refresh_scheduled = False
+        
+        # (widget, option, palette key) for every widget recoloured by toggle_theme
+        self._themed_widgets: List[Tuple[tk.Misc, str, str]] = []
+        
+        # Reusable notification label and its pending hide callback
+        self._toast_label: Optional[tk.Label] = None
+        self._toast_job: Optional[str] = None
+        
+        # History window, built on first use and hidden rather than destroyed on close
+        self._history_window: Optional[tk.Toplevel] = None
+        self._history_listbox: Optional[tk.Listbox] = None
+        
+        # Background thread for engine work that should not block the UI thread
+        self._worker = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         
         self.setup_gui()
         self.setup_keyboard_bindings()
         
+        # Refresh the status bar only when the engine reports a change
+        self.engine.on_change = self._on_engine_change
+        self.root.bind("<<StatusChanged>>", lambda event: self.update_status())
+        
     def setup_gui(self):
         """Initialize the GUI components."""
         self.root.title("Advanced Calculator")
         self.root.geometry("450x700")
         self.root.resizable(True, True)
-        self.root.configure(bg='#2b2b2b')
+        palette = self._palette()
+        self.root.configure(bg=palette['bg'])
+        self._register_themed(self.root, bg='bg')
         
         # Set window icon and styling
         self.root.configure(relief='flat', bd=0)
         
-        # Configure style
+        # Configure fonts and style
+        self.setup_fonts()
         self.setup_styles()
         
         # Create main frame with modern styling
-        main_frame = tk.Frame(self.root, bg='#2b2b2b', padx=20, pady=20)
+        main_frame = ttk.Frame(self.root, style='Calc.TFrame', padding=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Create display frame
@@ -279,6 +491,13 @@ class CalculatorGUI:
         # Create status bar
         self.create_status_bar(main_frame)
         
+    def setup_fonts(self):
+        """Create the named fonts shared by all widgets and styles."""
+        self._fonts = {
+            name: tkfont.Font(self.root, name=name, family=FONT_FAMILY, size=size, weight=weight)
+            for name, (size, weight) in FONT_SPECS.items()
+        }
+    
     def setup_styles(self):
         """Setup custom styles for the calculator."""
         style = ttk.Style()
@@ -286,79 +505,47 @@ class CalculatorGUI:
         # Configure modern dark theme
         style.theme_use('clam')
         
-        # Configure button styles with modern colors and better appearance
-        style.configure('Number.TButton', 
-                       font=('Segoe UI', 12, 'bold'),
-                       background='#404040',
-                       foreground='#ffffff',
-                       borderwidth=1,
-                       relief='raised',
-                       focuscolor='none',
-                       padding=(5, 5))
-        
-        style.map('Number.TButton',
-                 background=[('active', '#505050'),
-                           ('pressed', '#606060')])
-        
-        style.configure('Operator.TButton',
-                       font=('Segoe UI', 12, 'bold'),
-                       background='#ff6b35',
-                       foreground='#ffffff',
-                       borderwidth=1,
-                       relief='raised',
-                       focuscolor='none',
-                       padding=(5, 5))
-        
-        style.map('Operator.TButton',
-                 background=[('active', '#ff7b45'),
-                           ('pressed', '#ff8b55')])
-        
-        style.configure('Function.TButton',
-                       font=('Segoe UI', 9, 'bold'),
-                       background='#4a90e2',
-                       foreground='#ffffff',
-                       borderwidth=1,
-                       relief='raised',
-                       focuscolor='none',
-                       padding=(3, 3))
-        
-        style.map('Function.TButton',
-                 background=[('active', '#5aa0f2'),
-                           ('pressed', '#6ab0ff')])
-        
-        style.configure('Memory.TButton',
-                       font=('Segoe UI', 8, 'bold'),
-                       background='#7b68ee',
-                       foreground='#ffffff',
-                       borderwidth=1,
-                       relief='raised',
-                       focuscolor='none',
-                       padding=(2, 2))
-        
-        style.map('Memory.TButton',
-                 background=[('active', '#8b78fe'),
-                           ('pressed', '#9b88ff')])
-        
-        style.configure('Equals.TButton',
-                       font=('Segoe UI', 14, 'bold'),
-                       background='#32cd32',
-                       foreground='#ffffff',
-                       borderwidth=1,
-                       relief='raised',
-                       focuscolor='none',
-                       padding=(5, 8))
-        
-        style.map('Equals.TButton',
-                 background=[('active', '#42dd42'),
-                           ('pressed', '#52ed52')])
+        # Options shared by every button style
+        base = dict(foreground=BUTTON_FG, borderwidth=1, relief='raised', focuscolor='none')
+        
+        # (style name, font, BUTTON_COLORS key, padding)
+        button_styles = [
+            ('Number.TButton', 'CalcNumberFont', 'number', (5, 5)),
+            ('Operator.TButton', 'CalcNumberFont', 'operator', (5, 5)),
+            ('Function.TButton', 'CalcFunctionFont', 'function', (3, 3)),
+            ('Memory.TButton', 'CalcMemoryFont', 'memory', (2, 2)),
+            ('Equals.TButton', 'CalcEqualsFont', 'equals', (5, 8)),
+        ]
         
+        for name, font, colors, padding in button_styles:
+            background, active, pressed = BUTTON_COLORS[colors]
+            style.configure(name, font=font, background=background, padding=padding, **base)
+            style.map(name, background=[('active', active), ('pressed', pressed)])
+        
+        # Flat dialog buttons; Clear.Flat.TButton and Close.Flat.TButton inherit from Flat.TButton
+        style.configure('Flat.TButton', font='CalcButtonFont', foreground=BUTTON_FG,
+                        padding=(20, 8), relief='flat', borderwidth=0, focuscolor='none')
+        for name, colors in (('Clear.Flat.TButton', 'operator'), ('Close.Flat.TButton', 'number')):
+            background, active, pressed = BUTTON_COLORS[colors]
+            style.configure(name, background=background)
+            style.map(name, background=[('active', active), ('pressed', pressed)])
+        
+        self._apply_frame_styles(style)
+        
+    def _apply_frame_styles(self, style: ttk.Style):
+        """Colour the shared frame styles from the current palette."""
+        palette = self._palette()
+        for name, key in self._FRAME_STYLES.items():
+            style.configure(name, background=palette[key])
+    
     def create_display_frame(self, parent):
         """Create the display area for expressions and results."""
-        display_frame = tk.Frame(parent, bg='#2b2b2b')
+        palette = self._palette()
+        display_frame = ttk.Frame(parent, style='Calc.TFrame')
         display_frame.pack(fill=tk.X, pady=(0, 25))
         
         # Create rounded display container
-        display_container = tk.Frame(display_frame, bg='#1a1a1a', relief='flat', bd=0)
+        display_container = ttk.Frame(display_frame, style='Display.TFrame')
         display_container.pack(fill=tk.X, ipady=15)
         
         # Expression display (smaller, top)
@@ -366,119 +553,132 @@ class CalculatorGUI:
         self.expression_display = tk.Label(
             display_container,
             textvariable=self.expression_var,
-            font=('Segoe UI', 14),
-            fg='#888888',
-            bg='#1a1a1a',
+            font='CalcExpressionFont',
+            fg=palette['muted_fg'],
+            bg=palette['display_bg'],
             anchor='e',
             padx=25,
             pady=15
         )
         self.expression_display.pack(fill=tk.X)
+        self._register_themed(self.expression_display, fg='muted_fg', bg='display_bg')
         
         # Result display (larger, bottom)
         self.result_var = tk.StringVar(value="0")
         self.result_display = tk.Label(
             display_container,
             textvariable=self.result_var,
-            font=('Segoe UI', 28, 'bold'),
-            fg='#ffffff',
-            bg='#1a1a1a',
+            font='CalcResultFont',
+            fg=palette['fg'],
+            bg=palette['display_bg'],
             anchor='e',
             padx=25,
             pady=15
         )
         self.result_display.pack(fill=tk.X)
+        self._register_themed(self.result_display, fg='fg', bg='display_bg')
         
     def create_control_frame(self, parent):
         """Create control buttons (clear, memory, etc.)."""
-        control_frame = tk.Frame(parent, bg='#2b2b2b')
+        control_frame = ttk.Frame(parent, style='Calc.TFrame')
         control_frame.pack(fill=tk.X, pady=(0, 20))
         
-        # First row of controls
-        control_row1 = tk.Frame(control_frame, bg='#2b2b2b')
-        control_row1.pack(fill=tk.X, pady=(0, 10))
-        
-        # Clear buttons
-        ttk.Button(control_row1, text="C", command=self.clear_entry, style='Operator.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row1, text="AC", command=self.clear_all, style='Operator.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row1, text="DEL", command=self.backspace, style='Operator.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        
-        # Memory buttons
-        ttk.Button(control_row1, text="MS", command=self.memory_store, style='Memory.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row1, text="MR", command=self.memory_recall, style='Memory.TButton').pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        # Second row of controls
-        control_row2 = tk.Frame(control_frame, bg='#2b2b2b')
-        control_row2.pack(fill=tk.X)
+        for i in range(5):  # 5 columns
+            control_frame.grid_columnconfigure(i, weight=1, uniform='control')
+        
+        # Clear and memory buttons on the first row, memory/history/angle controls on the second
+        layout = [
+            [("C", self.clear_entry, 'Operator.TButton'),
+             ("AC", self.clear_all, 'Operator.TButton'),
+             ("DEL", self.backspace, 'Operator.TButton'),
+             ("MS", self.memory_store, 'Memory.TButton'),
+             ("MR", self.memory_recall, 'Memory.TButton')],
+            [("MC", self.memory_clear, 'Memory.TButton'),
+             ("M+", self.memory_add, 'Memory.TButton'),
+             ("M-", self.memory_subtract, 'Memory.TButton'),
+             ("HIST", self.show_history, 'Function.TButton'),
+             ("DEG/RAD", self.toggle_angle_mode, 'Function.TButton')],
+        ]
         
-        ttk.Button(control_row2, text="MC", command=self.memory_clear, style='Memory.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row2, text="M+", command=self.memory_add, style='Memory.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row2, text="M-", command=self.memory_subtract, style='Memory.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row2, text="HIST", command=self.show_history, style='Function.TButton').pack(side=tk.LEFT, padx=(0, 10), fill=tk.X, expand=True)
-        ttk.Button(control_row2, text="DEG/RAD", command=self.toggle_angle_mode, style='Function.TButton').pack(side=tk.LEFT, fill=tk.X, expand=True)
+        for r, row in enumerate(layout):
+            for c, (text, command, style) in enumerate(row):
+                ttk.Button(control_frame, text=text, command=command, style=style).grid(
+                    row=r, column=c, padx=(0, 10) if c < 4 else 0, pady=(0, 10) if r == 0 else 0, sticky='nsew')
         
     def create_button_frame(self, parent):
         """Create the main button grid."""
-        button_frame = tk.Frame(parent, bg='#2b2b2b')
+        button_frame = ttk.Frame(parent, style='Calc.TFrame')
         button_frame.pack(fill=tk.BOTH, expand=True)
         
         # Configure grid weights for proper button sizing
         for i in range(8):  # 8 rows
             button_frame.grid_rowconfigure(i, weight=1)
         for i in range(5):  # 5 columns
-            button_frame.grid_columnconfigure(i, weight=1)
-        
-        # Row 1: Advanced functions
-        ttk.Button(button_frame, text="sin", command=lambda: self.add_function("sin("), style='Function.TButton').grid(row=0, column=0, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="cos", command=lambda: self.add_function("cos("), style='Function.TButton').grid(row=0, column=1, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="tan", command=lambda: self.add_function("tan("), style='Function.TButton').grid(row=0, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="log", command=lambda: self.add_function("log("), style='Function.TButton').grid(row=0, column=3, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="ln", command=lambda: self.add_function("ln("), style='Function.TButton').grid(row=0, column=4, padx=5, pady=5, sticky='nsew')
-        
-        # Row 2: More functions
-        ttk.Button(button_frame, text="√", command=lambda: self.add_function("sqrt("), style='Function.TButton').grid(row=1, column=0, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="x²", command=lambda: self.add_function("^2"), style='Function.TButton').grid(row=1, column=1, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="x^y", command=lambda: self.add_function("^"), style='Function.TButton').grid(row=1, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="1/x", command=lambda: self.add_function("1/"), style='Function.TButton').grid(row=1, column=3, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="|x|", command=lambda: self.add_function("abs("), style='Function.TButton').grid(row=1, column=4, padx=5, pady=5, sticky='nsew')
-        
-        # Row 3: Constants and special
-        ttk.Button(button_frame, text="π", command=lambda: self.add_number("π"), style='Function.TButton').grid(row=2, column=0, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="e", command=lambda: self.add_number("e"), style='Function.TButton').grid(row=2, column=1, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="n!", command=lambda: self.add_function("factorial("), style='Function.TButton').grid(row=2, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="%", command=lambda: self.add_operator("%"), style='Function.TButton').grid(row=2, column=3, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="(", command=lambda: self.add_operator("("), style='Function.TButton').grid(row=2, column=4, padx=5, pady=5, sticky='nsew')
-        
-        # Row 4: Numbers and operators
-        ttk.Button(button_frame, text="7", command=lambda: self.add_number("7"), style='Number.TButton').grid(row=3, column=0, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="8", command=lambda: self.add_number("8"), style='Number.TButton').grid(row=3, column=1, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="9", command=lambda: self.add_number("9"), style='Number.TButton').grid(row=3, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="/", command=lambda: self.add_operator("/"), style='Operator.TButton').grid(row=3, column=3, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text=")", command=lambda: self.add_operator(")"), style='Function.TButton').grid(row=3, column=4, padx=5, pady=5, sticky='nsew')
-        
-        # Row 5: Numbers and operators
-        ttk.Button(button_frame, text="4", command=lambda: self.add_number("4"), style='Number.TButton').grid(row=4, column=0, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="5", command=lambda: self.add_number("5"), style='Number.TButton').grid(row=4, column=1, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="6", command=lambda: self.add_number("6"), style='Number.TButton').grid(row=4, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="*", command=lambda: self.add_operator("*"), style='Operator.TButton').grid(row=4, column=3, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="±", command=self.toggle_sign, style='Operator.TButton').grid(row=4, column=4, padx=5, pady=5, sticky='nsew')
-        
-        # Row 6: Numbers and operators
-        ttk.Button(button_frame, text="1", command=lambda: self.add_number("1"), style='Number.TButton').grid(row=5, column=0, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="2", command=lambda: self.add_number("2"), style='Number.TButton').grid(row=5, column=1, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="3", command=lambda: self.add_number("3"), style='Number.TButton').grid(row=5, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="-", command=lambda: self.add_operator("-"), style='Operator.TButton').grid(row=5, column=3, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="=", command=self.calculate, style='Equals.TButton').grid(row=5, column=4, rowspan=2, padx=5, pady=5, sticky='nsew')
-        
-        # Row 7: Bottom row
-        ttk.Button(button_frame, text="0", command=lambda: self.add_number("0"), style='Number.TButton').grid(row=6, column=0, columnspan=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text=".", command=self.add_decimal, style='Number.TButton').grid(row=6, column=2, padx=5, pady=5, sticky='nsew')
-        ttk.Button(button_frame, text="+", command=lambda: self.add_operator("+"), style='Operator.TButton').grid(row=6, column=3, padx=5, pady=5, sticky='nsew')
+            button_frame.grid_columnconfigure(i, weight=1, uniform='btn')
+        
+        # One entry per grid cell; None marks a cell covered by a spanning button
+        layout = [
+            # Row 1: Advanced functions
+            [("sin", 'Function.TButton'),
+             ("cos", 'Function.TButton'),
+             ("tan", 'Function.TButton'),
+             ("log", 'Function.TButton'),
+             ("ln", 'Function.TButton')],
+            # Row 2: More functions
+            [("√", 'Function.TButton'),
+             ("x²", 'Function.TButton'),
+             ("x^y", 'Function.TButton'),
+             ("1/x", 'Function.TButton'),
+             ("|x|", 'Function.TButton')],
+            # Row 3: Constants and special
+            [("π", 'Function.TButton'),
+             ("e", 'Function.TButton'),
+             ("n!", 'Function.TButton'),
+             ("%", 'Function.TButton'),
+             ("(", 'Function.TButton')],
+            # Row 4: Numbers and operators
+            [("7", 'Number.TButton'),
+             ("8", 'Number.TButton'),
+             ("9", 'Number.TButton'),
+             ("/", 'Operator.TButton'),
+             (")", 'Function.TButton')],
+            # Row 5: Numbers and operators
+            [("4", 'Number.TButton'),
+             ("5", 'Number.TButton'),
+             ("6", 'Number.TButton'),
+             ("*", 'Operator.TButton'),
+             ("±", 'Operator.TButton')],
+            # Row 6: Numbers and operators
+            [("1", 'Number.TButton'),
+             ("2", 'Number.TButton'),
+             ("3", 'Number.TButton'),
+             ("-", 'Operator.TButton'),
+             ("=", 'Equals.TButton')],
+            # Row 7: Bottom row
+            [("0", 'Number.TButton'),
+             None,
+             (".", 'Number.TButton'),
+             ("+", 'Operator.TButton'),
+             None],
+        ]
+        
+        # (rowspan, columnspan) for buttons covering more than one cell
+        spans = {"=": (2, 1), "0": (1, 2)}
+        
+        for r, row in enumerate(layout):
+            for c, cell in enumerate(row):
+                if cell is None:
+                    continue
+                text, style = cell
+                rowspan, columnspan = spans.get(text, (1, 1))
+                ttk.Button(button_frame, text=text, command=functools.partial(self._on_button, text), style=style).grid(
+                    row=r, column=c, rowspan=rowspan, columnspan=columnspan, padx=5, pady=5, sticky='nsew')
     
     
     def create_status_bar(self, parent):
         """Create status bar showing angle mode and memory indicator."""
-        status_frame = tk.Frame(parent, bg='#2b2b2b')
+        palette = self._palette()
+        status_frame = ttk.Frame(parent, style='Calc.TFrame')
         status_frame.pack(fill=tk.X, pady=(15, 0))
         
         # Status info
@@ -486,26 +686,46 @@ class CalculatorGUI:
         status_label = tk.Label(
             status_frame, 
             textvariable=self.status_var, 
-            font=('Segoe UI', 10),
-            fg='#888888',
-            bg='#2b2b2b'
+            font='CalcStatusFont',
+            fg=palette['muted_fg'],
+            bg=palette['bg']
         )
         status_label.pack(side=tk.LEFT)
+        self._register_themed(status_label, fg='muted_fg', bg='bg')
         
         # Theme toggle button
-        theme_btn = tk.Button(
+        self._theme_button = tk.Button(
             status_frame,
-            text="🌙",
+            text="☾",
             command=self.toggle_theme,
-            font=('Segoe UI', 12),
-            bg='#404040',
-            fg='#ffffff',
+            font='CalcIconFont',
+            bg=palette['btn_bg'],
+            fg=palette['btn_fg'],
             relief='flat',
             bd=0,
             padx=10,
             pady=5
         )
-        theme_btn.pack(side=tk.RIGHT)
+        self._theme_button.pack(side=tk.RIGHT)
+        self._register_themed(self._theme_button, bg='btn_bg', fg='btn_fg')
+    
+    def _palette(self) -> Mapping[str, str]:
+        """Return the colour palette for the current theme."""
+        return THEMES['dark' if self.dark_theme else 'light']
+    
+    def _register_themed(self, widget, **options):
+        """Record which palette key drives each colour option of a widget; returns the widget."""
+        for option, key in options.items():
+            self._themed_widgets.append((widget, option, key))
+        return widget
+    
+    def _on_button(self, token: str):
+        """Dispatch a keypad button press by its text."""
+        action = self._TOKEN_ACTIONS.get(token)
+        if action:
+            action(self)
+        else:
+            self.add_number(token)
     
     def setup_keyboard_bindings(self):
         """Setup keyboard shortcuts."""
@@ -554,6 +774,7 @@ class CalculatorGUI:
         if self.is_new_calculation:
             self.current_expression = number
             self.is_new_calculation = False
+            self._num_has_dot = False
         else:
             self.current_expression += number
         
@@ -566,6 +787,7 @@ class CalculatorGUI:
             self.is_new_calculation = False
         else:
             self.current_expression += operator
+        self._num_has_dot = False
         
         self.update_display()
     
@@ -573,6 +795,7 @@ class CalculatorGUI:
         """Add a mathematical function to the current expression."""
         self.current_expression += function
         self.is_new_calculation = False
+        self._num_has_dot = False
         self.update_display()
     
     def add_decimal(self):
@@ -580,12 +803,13 @@ class CalculatorGUI:
         if self.is_new_calculation:
             self.current_expression = "0."
             self.is_new_calculation = False
-        else:
-            # Check if current number already has decimal point
+            self._num_has_dot = True
+        elif not self._num_has_dot:
             if not self.current_expression or self.current_expression[-1] in '+-*/^(':
                 self.current_expression += "0."
-            elif '.' not in self.current_expression.split()[-1] if ' ' in self.current_expression else '.' not in self.current_expression:
+            else:
                 self.current_expression += "."
+            self._num_has_dot = True
         
         self.update_display()
     
@@ -603,6 +827,7 @@ class CalculatorGUI:
         self.current_expression = ""
         self.current_result = "0"
         self.is_new_calculation = True
+        self._num_has_dot = False
         self.update_display()
     
     def clear_all(self):
@@ -610,18 +835,33 @@ class CalculatorGUI:
         self.current_expression = ""
         self.current_result = "0"
         self.is_new_calculation = True
+        self._num_has_dot = False
         self.engine.clear_history()
+        self._refresh_history_list()
         self.update_display()
-        self.update_status()
     
     def backspace(self):
         """Remove the last character from the current expression."""
         if self.current_expression:
+            removed = self.current_expression[-1]
             self.current_expression = self.current_expression[:-1]
+            if removed == '.':
+                self._num_has_dot = False
+            elif not removed.isdigit():
+                # Back into the previous number; check only its own characters
+                self._num_has_dot = self._trailing_number_has_dot(self.current_expression)
             if not self.current_expression:
                 self.is_new_calculation = True
             self.update_display()
     
+    @staticmethod
+    def _trailing_number_has_dot(expression: str) -> bool:
+        """Return whether the number at the end of the expression already contains a '.'."""
+        i = len(expression)
+        while i and (expression[i - 1].isdigit() or expression[i - 1] == '.'):
+            i -= 1
+        return '.' in expression[i:]
+    
     def calculate(self):
         """Calculate the current expression."""
         if not self.current_expression:
@@ -632,29 +872,22 @@ class CalculatorGUI:
             
             if isinstance(result, str) and result.startswith("Error:"):
                 self.current_result = result
-                self.expression_var.set(self.current_expression)
             else:
-                # Format result for display
-                if isinstance(result, Decimal):
-                    if result == int(result):
-                        self.current_result = str(int(result))
-                    else:
-                        self.current_result = str(result)
+                # Format result for display; past 2**53 floats are not exact integers,
+                # so int() would print representation noise
+                if isinstance(result, float) and result.is_integer() and abs(result) < self._EXACT_INT_LIMIT:
+                    self.current_result = str(int(result))
                 else:
                     self.current_result = str(result)
                 
                 # Add to history
                 self.engine.add_to_history(self.current_expression, self.current_result)
-                
-                # Update expression display
-                self.expression_var.set(f"{self.current_expression} =")
             
             self.is_new_calculation = True
             self.update_display()
-            self.update_status()
             
         except Exception as e:
-            logger.error(f"Error in calculate: {e}")
+            logger.error("Error in calculate: %s", e)
             self.current_result = "Error: Calculation failed"
             self.update_display()
     
@@ -662,7 +895,6 @@ class CalculatorGUI:
         """Store current result in memory."""
         if not self.current_result.startswith("Error:"):
             self.engine.memory_store(self.current_result)
-            self.update_status()
     
     def memory_recall(self):
         """Recall value from memory."""
@@ -674,19 +906,16 @@ class CalculatorGUI:
     def memory_clear(self):
         """Clear memory."""
         self.engine.memory_clear()
-        self.update_status()
     
     def memory_add(self):
         """Add current result to memory."""
         if not self.current_result.startswith("Error:"):
             self.engine.memory_add(self.current_result)
-            self.update_status()
     
     def memory_subtract(self):
         """Subtract current result from memory."""
         if not self.current_result.startswith("Error:"):
             self.engine.memory_subtract(self.current_result)
-            self.update_status()
     
     def toggle_angle_mode(self):
         """Toggle between degree and radian mode."""
@@ -694,139 +923,248 @@ class CalculatorGUI:
             self.engine.set_angle_mode('RAD')
         else:
             self.engine.set_angle_mode('DEG')
-        self.update_status()
     
     def show_history(self):
-        """Show calculation history in a new window."""
+        """Show calculation history, reusing the history window once it has been built."""
         history = self.engine.get_history()
         
         if not history:
             messagebox.showinfo("History", "No calculations in history.")
             return
         
+        if self._history_window is None:
+            self._build_history_window()
+        self._refresh_history_list(history)
+        self._history_window.deiconify()
+        self._history_window.lift()
+    
+    def _build_history_window(self):
+        """Create the history window and its widgets, withdrawn until show_history maps it."""
+        palette = self._palette()
+        
         # Create history window with modern styling
         history_window = tk.Toplevel(self.root)
         history_window.title("Calculation History")
         history_window.geometry("600x500")
-        history_window.configure(bg='#2b2b2b')
+        history_window.configure(bg=palette['bg'])
         history_window.resizable(True, True)
+        history_window.protocol("WM_DELETE_WINDOW", history_window.withdraw)
+        history_window.transient(self.root)
+        history_window.withdraw()
+        self._register_themed(history_window, bg='bg')
         
         # Create header
-        header_frame = tk.Frame(history_window, bg='#1a1a1a', height=50)
+        header_frame = ttk.Frame(history_window, style='Display.TFrame', height=50)
         header_frame.pack(fill=tk.X, padx=20, pady=(20, 10))
         header_frame.pack_propagate(False)
         
         title_label = tk.Label(
             header_frame,
             text="📊 Calculation History",
-            font=('Segoe UI', 16, 'bold'),
-            fg='#ffffff',
-            bg='#1a1a1a'
+            font='CalcTitleFont',
+            fg=palette['fg'],
+            bg=palette['display_bg']
         )
         title_label.pack(expand=True)
+        self._register_themed(title_label, fg='fg', bg='display_bg')
         
         # Create frame with scrollbar
-        frame = tk.Frame(history_window, bg='#2b2b2b')
+        frame = ttk.Frame(history_window, style='Calc.TFrame')
         frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
         
         # Create listbox with modern styling
         listbox = tk.Listbox(
             frame, 
-            font=('Segoe UI', 11),
-            bg='#1a1a1a',
-            fg='#ffffff',
-            selectbackground='#4a90e2',
-            selectforeground='#ffffff',
+            font='CalcListFont',
+            bg=palette['display_bg'],
+            fg=palette['fg'],
+            selectbackground=BUTTON_COLORS['function'][0],
+            selectforeground=BUTTON_FG,
             relief='flat',
             bd=0,
             highlightthickness=0
         )
+        self._register_themed(listbox, bg='display_bg', fg='fg')
         
-        scrollbar = tk.Scrollbar(frame, orient=tk.VERTICAL, command=listbox.yview, bg='#404040')
+        scrollbar = tk.Scrollbar(frame, orient=tk.VERTICAL, command=listbox.yview, bg=BUTTON_COLORS['number'][0])
         listbox.configure(yscrollcommand=scrollbar.set)
         
-        # Add history items
-        for i, (expression, result) in enumerate(history, 1):
-            listbox.insert(tk.END, f"{i:3d}. {expression} = {result}")
-        
         # Pack widgets
         listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Add buttons with modern styling
-        button_frame = tk.Frame(history_window, bg='#2b2b2b')
+        # Fixed height so the packer does not re-measure the footer when its buttons change
+        button_frame = ttk.Frame(history_window, style='Calc.TFrame', height=48)
         button_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+        button_frame.pack_propagate(False)
         
-        clear_btn = tk.Button(
+        clear_btn = ttk.Button(
             button_frame,
-            text="🗑️ Clear History",
-            command=lambda: self.clear_history(history_window),
-            font=('Segoe UI', 10, 'bold'),
-            bg='#ff6b35',
-            fg='#ffffff',
-            relief='flat',
-            bd=0,
-            padx=20,
-            pady=8
+            text="Clear History",
+            command=functools.partial(self.clear_history, history_window),
+            style='Clear.Flat.TButton'
         )
         clear_btn.pack(side=tk.LEFT, padx=(0, 10))
         
-        close_btn = tk.Button(
+        close_btn = ttk.Button(
             button_frame,
-            text="❌ Close",
-            command=history_window.destroy,
-            font=('Segoe UI', 10, 'bold'),
-            bg='#404040',
-            fg='#ffffff',
-            relief='flat',
-            bd=0,
-            padx=20,
-            pady=8
+            text="✕ Close",
+            command=history_window.withdraw,
+            style='Close.Flat.TButton'
         )
         close_btn.pack(side=tk.RIGHT)
+        
+        # Resolve geometry once so later deiconify calls skip the layout pass
+        history_window.update_idletasks()
+        
+        self._history_window = history_window
+        self._history_listbox = listbox
+    
+    def _refresh_history_list(self, history: Optional[List[Tuple[str, str]]] = None):
+        """Replace the history window's entries with the engine's current history."""
+        if self._history_listbox is None:
+            return
+        if history is None:
+            history = self.engine.get_history()
+        
+        # Add history items in a single insert call
+        items = [f"{i:3d}. {expression} = {result}" for i, (expression, result) in enumerate(history, 1)]
+        self._history_listbox.delete(0, tk.END)
+        if items:
+            self._history_listbox.insert(tk.END, *items)
     
     def clear_history(self, window):
-        """Clear calculation history."""
-        self.engine.clear_history()
-        window.destroy()
-        messagebox.showinfo("History", "History cleared.")
+        """Clear calculation history on the worker thread; the UI thread polls for completion."""
+        window.withdraw()
+        future = self._worker.submit(self.engine.clear_history)
+        self.root.after(self._POLL_MS, self._poll_history_cleared, future)
+    
+    def _poll_history_cleared(self, future: concurrent.futures.Future):
+        """Refresh the history list and confirm once the worker has cleared the history."""
+        # Tk is only touched from the UI thread, so check back instead of using a done-callback
+        if not future.done():
+            self.root.after(self._POLL_MS, self._poll_history_cleared, future)
+            return
+        future.result()
+        self._refresh_history_list()
+        self._show_toast("History cleared")
+    
+    def _show_toast(self, text: str):
+        """Show a short message over the main window that hides itself after 1.5 seconds."""
+        if self._toast_label is None:
+            palette = self._palette()
+            self._toast_label = tk.Label(
+                self.root,
+                font='CalcStatusFont',
+                bg=palette['btn_bg'],
+                fg=palette['btn_fg'],
+                padx=12,
+                pady=6
+            )
+            self._register_themed(self._toast_label, bg='btn_bg', fg='btn_fg')
+        elif self._toast_job is not None:
+            self.root.after_cancel(self._toast_job)
+        
+        self._toast_label.configure(text=text)
+        self._toast_label.place(relx=0.5, rely=0.92, anchor='center')
+        self._toast_job = self.root.after(1500, self._hide_toast)
+    
+    def _hide_toast(self):
+        """Hide the notification label."""
+        self._toast_job = None
+        self._toast_label.place_forget()
     
     def toggle_theme(self):
-        """Toggle between light and dark themes."""
+        """Toggle between light and dark themes by recolouring the frame styles and registered widgets."""
         self.dark_theme = not self.dark_theme
+        palette = self._palette()
         
-        if self.dark_theme:
-            # Already in dark theme, show message
-            messagebox.showinfo("Theme", "Already using dark theme! 🌙")
-        else:
-            # This is a placeholder for light theme switching
-            messagebox.showinfo("Theme", "Light theme coming soon! ☀️")
+        self._apply_frame_styles(ttk.Style())
+        for widget, option, key in self._themed_widgets:
+            widget.configure(**{option: palette[key]})
+        self._theme_button.configure(text="☾" if self.dark_theme else "☀")
     
     def update_display(self):
-        """Update the display with current expression and result."""
-        self.expression_var.set(self.current_expression)
-        self.result_var.set(self.current_result)
+        """Schedule a display update; repeated calls before the next idle coalesce into one."""
+        self._pending_display = True
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """Queue the single after_idle callback that flushes both the display and the status bar."""
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.root.after_idle(self._flush_pending)
+    
+    def _flush_pending(self):
+        """Write whichever of the display and status bar were marked for update."""
+        self._refresh_scheduled = False
+        if self._pending_display:
+            self._pending_display = False
+            self._flush_display()
+        if self._pending_status:
+            self._pending_status = False
+            self._flush_status()
+    
+    def _flush_display(self):
+        """Write the current expression and result to the display, skipping unchanged values."""
+        if self.current_expression != self._last_expr_shown:
+            self.expression_var.set(self.current_expression)
+            self._last_expr_shown = self.current_expression
+        if self.current_result != self._last_result_shown:
+            self.result_var.set(self.current_result)
+            self._last_result_shown = self.current_result
+    
+    def _on_engine_change(self):
+        """Queue a status bar refresh after the engine's angle mode or memory changed."""
+        self.root.event_generate("<<StatusChanged>>", when="tail")
     
     def update_status(self):
-        """Update the status bar."""
-        memory_value = self.engine.memory_recall()
-        status_text = f"{self.engine.angle_mode} | M: {memory_value}"
+        """Schedule a status bar update; it shares the display's pending idle callback."""
+        self._pending_status = True
+        self._schedule_refresh()
+    
+    def _flush_status(self):
+        """Write the status bar text if it changed."""
+        status_text = self._STATUS_TEMPLATE % (self.engine.angle_mode, self._memory_recall())
+        if status_text == self._last_status:
+            return
         self.status_var.set(status_text)
+        self._last_status = status_text
     
     def run(self):
         """Start the calculator application."""
+        # The calculator only takes plain key presses, so skip input method (XIM) handling
+        self.root.tk.call('tk', 'useinputmethods', '0')
         self.update_status()
         self.root.mainloop()
+        self._worker.shutdown(wait=False)
+
+
+def _log_uncaught_exception(exc_type, exc_value, exc_tb):
+    """sys.excepthook that routes uncaught exceptions to the logger."""
+    if issubclass(exc_type, KeyboardInterrupt):
+        sys.__excepthook__(exc_type, exc_value, exc_tb)
+        return
+    logger.error("Uncaught exception", exc_info=(exc_type, exc_value, exc_tb))
+
+
+def _log_callback_exception(exc_type, exc_value, exc_tb):
+    """Tk report_callback_exception handler; logs the error and keeps the mainloop running."""
+    logger.error("Error in Tk callback", exc_info=(exc_type, exc_value, exc_tb))
 
 
 def main():
     """Main function to run the calculator."""
+    sys.excepthook = _log_uncaught_exception
     try:
         calculator = CalculatorGUI()
-        calculator.run()
-    except Exception as e:
-        logger.error(f"Failed to start calculator: {e}")
-        messagebox.showerror("Error", f"Failed to start calculator: {e}")
+    except tk.TclError as e:
+        # No usable display; report on stderr rather than through another Tk root
+        logger.error("Failed to start calculator: %s", e, exc_info=True)
+        sys.exit(1)
+    calculator.root.report_callback_exception = _log_callback_exception
+    calculator.run()
 
 
 if __name__ == "__main__":
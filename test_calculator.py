@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Tests for the calculator engine."""
+
+import math
+import unittest
+
+from calculator import CalculatorEngine, CalculatorGUI
+
+
+class TestExpressionWhitelist(unittest.TestCase):
+    """The AST walker evaluates only numbers, known names, operators and functions."""
+
+    INVALID = "Error: Invalid expression"
+
+    def setUp(self):
+        self.engine = CalculatorEngine()
+
+    def test_rejects_attribute_access_other_than_math_functions(self):
+        self.assertEqual(self.engine.safe_eval("math.__class__"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("math.__class__()"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("math.pi"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("(1).real"), self.INVALID)
+
+    def test_rejects_unknown_names(self):
+        self.assertEqual(self.engine.safe_eval("x + 1"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("__import__('os')"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("open('x')"), self.INVALID)
+
+    def test_rejects_keyword_arguments(self):
+        self.assertEqual(self.engine.safe_eval("abs(x=-1)"), self.INVALID)
+
+    def test_rejects_starred_arguments(self):
+        self.assertEqual(self.engine.safe_eval("abs(*[-1])"), self.INVALID)
+
+    def test_rejects_non_numeric_constants(self):
+        self.assertEqual(self.engine.safe_eval("'abc'"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("True"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("None"), self.INVALID)
+        self.assertEqual(self.engine.safe_eval("2j"), self.INVALID)
+
+    def test_resolves_constants(self):
+        self.assertEqual(self.engine.safe_eval("e"), math.e)
+        self.assertEqual(self.engine.safe_eval("pi"), math.pi)
+        self.assertEqual(self.engine.safe_eval("π*2"), math.pi * 2)
+
+    def test_exponent_notation(self):
+        self.assertEqual(self.engine.safe_eval("1e3"), 1000.0)
+        self.assertEqual(self.engine.safe_eval("2.5e-1*4"), 1.0)
+
+    def test_factorial_returns_int(self):
+        result = self.engine.safe_eval("factorial(25)")
+        self.assertIsInstance(result, int)
+        self.assertEqual(result, math.factorial(25))
+
+    def test_arithmetic_operators(self):
+        self.assertEqual(self.engine.safe_eval("1+2*3-4/2"), 5.0)
+        self.assertEqual(self.engine.safe_eval("1//2"), 0)
+        self.assertEqual(self.engine.safe_eval("2^10"), 1024)
+        self.assertEqual(self.engine.safe_eval("-(-3)"), 3)
+        self.assertEqual(self.engine.safe_eval("1/0"), "Error: Division by zero")
+
+
+class TestAngleMode(unittest.TestCase):
+    """Trigonometric functions must honour the engine's angle mode."""
+
+    def setUp(self):
+        self.engine = CalculatorEngine()
+
+    def test_inverse_trig_returns_degrees_in_deg_mode(self):
+        self.assertAlmostEqual(self.engine.safe_eval("asin(1)"), 90.0)
+        self.assertAlmostEqual(self.engine.safe_eval("acos(0)"), 90.0)
+        self.assertAlmostEqual(self.engine.safe_eval("atan(1)"), 45.0)
+
+    def test_inverse_trig_returns_radians_in_rad_mode(self):
+        self.engine.set_angle_mode("RAD")
+        self.assertAlmostEqual(self.engine.safe_eval("asin(1)"), math.pi / 2)
+        self.assertAlmostEqual(self.engine.safe_eval("atan(1)"), math.pi / 4)
+
+    def test_parenthesised_argument_in_deg_mode(self):
+        self.assertAlmostEqual(self.engine.safe_eval("sin((20)+10)"), 0.5)
+        self.assertAlmostEqual(self.engine.safe_eval("cos(abs(-50)+10)"), 0.5)
+        self.assertAlmostEqual(self.engine.safe_eval("asin(sqrt(2)/2)"), 45.0)
+
+    def test_parenthesised_argument_in_rad_mode(self):
+        self.engine.set_angle_mode("RAD")
+        self.assertAlmostEqual(self.engine.safe_eval("sin((20)+10)"), math.sin(30))
+        self.assertAlmostEqual(self.engine.safe_eval("asin(sqrt(2)/2)"), math.pi / 4)
+
+    def test_nested_trig_call_in_deg_mode(self):
+        self.assertAlmostEqual(self.engine.safe_eval("sin(sin(30))"), math.sin(math.radians(0.5)))
+
+    def test_nested_log_call(self):
+        self.assertAlmostEqual(self.engine.safe_eval("log(log(100))"), math.log10(2))
+
+    def test_math_qualified_call_ignores_angle_mode(self):
+        self.assertAlmostEqual(self.engine.safe_eval("math.sin(1)"), math.sin(1))
+
+
+
+class TestTrailingNumberDot(unittest.TestCase):
+    """backspace re-derives whether the number being typed already has a '.'."""
+
+    has_dot = staticmethod(CalculatorGUI._trailing_number_has_dot)
+
+    def test_deleting_operator_returns_to_dotted_number(self):
+        # "1.5+" -> backspace -> "1.5": a further '.' must be refused
+        self.assertTrue(self.has_dot("1.5"))
+        self.assertTrue(self.has_dot("2*0.25"))
+
+    def test_deleting_into_function_name_allows_dot(self):
+        # "sin(" -> backspace -> "sin": a '.' starts a new number
+        self.assertFalse(self.has_dot("sin"))
+
+    def test_only_the_last_number_is_checked(self):
+        self.assertFalse(self.has_dot("1.5+2"))
+        self.assertFalse(self.has_dot("(1.5)"))
+        self.assertTrue(self.has_dot("1.5+2."))
+
+    def test_empty_expression(self):
+        self.assertFalse(self.has_dot(""))
+
+
+if __name__ == "__main__":
+    unittest.main()